@@ -0,0 +1,124 @@
+import zlib
+from typing import List, Sequence
+
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
+
+ZLIB_MAX_DICT_SIZE = 32 * 1024
+ZLIB_WBITS = -15
+
+
+class TextCodec:
+    """
+    Compresses and decompresses review texts with a shared dictionary, trained on a sample of reviews. Short texts like
+    reviews compress poorly on their own, the dictionary provides the common vocabulary to each of them.
+    """
+    METHODS = ('zstd', 'zlib')
+
+    def __init__(self, method: str, dictionary: bytes = b'', level: int = 9):
+        """
+        :param method: Compression method, either 'zstd' (requires zstandard) or 'zlib'.
+        :param dictionary: Shared compression dictionary, empty for no dictionary.
+        :param level: Compression level.
+        """
+        self.check_method(method)
+
+        self.method = method
+        self.dictionary = dictionary
+        self.level = level
+
+        if method == 'zstd':
+            dict_data = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+            self._compressor = zstandard.ZstdCompressor(level=level, dict_data=dict_data)
+            self._decompressor = zstandard.ZstdDecompressor(dict_data=dict_data)
+        else:
+            # Raw deflate streams apply the dictionary on creation, copies of these objects are already primed with it
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, ZLIB_WBITS, zdict=dictionary)
+            self._decompressor = zlib.decompressobj(ZLIB_WBITS, zdict=dictionary)
+
+    @classmethod
+    def check_method(cls, method: str) -> None:
+        """
+        Checks whether the compression method is known and its library is installed.
+
+        :param method: Compression method, either 'zstd' (requires zstandard) or 'zlib'.
+        """
+        if method not in cls.METHODS:
+            raise ValueError(f"Unknown compression method '{method}', choose one of {cls.METHODS}")
+        if method == 'zstd' and zstandard is None:
+            raise RuntimeError("Install zstandard in order to use zstd compression")
+
+    @classmethod
+    def train(cls, samples: Sequence[str], method: str = 'zstd', dict_size: int = 110 * 1024,
+              level: int = 9) -> 'TextCodec':
+        """
+        Creates a codec with a dictionary trained on the given sample texts.
+
+        :param samples: Sample of review texts.
+        :param method: Compression method, either 'zstd' or 'zlib'.
+        :param dict_size: Maximum dictionary size in bytes. Limited to 32 KiB for zlib.
+        :param level: Compression level.
+        :return: Trained codec.
+        """
+        cls.check_method(method)
+
+        encoded = [sample.encode('utf-8') for sample in samples]
+        if method == 'zstd':
+            try:
+                dictionary = zstandard.train_dictionary(dict_size, encoded, level=level).as_bytes()
+            except zstandard.ZstdError:
+                # Training fails for samples too small to learn from, compress without dictionary instead
+                return cls(method, b'', level)
+        else:
+            # zlib has no dictionary training, it uses the dictionary as preceding history. Strings at the end are
+            # cheapest to reference, so the sample is used as is up to the maximum dictionary size.
+            dictionary = b''.join(encoded)[-min(dict_size, ZLIB_MAX_DICT_SIZE):]
+        return cls(method, dictionary, level)
+
+    def compress(self, text: str) -> bytes:
+        """
+        :param text: Review text.
+        :return: Compressed review text.
+        """
+        data = text.encode('utf-8')
+        if self.method == 'zstd':
+            return self._compressor.compress(data)
+
+        compressor = self._compressor.copy()
+        return compressor.compress(data) + compressor.flush()
+
+    def decompress(self, blob: bytes) -> str:
+        """
+        :param blob: Compressed review text.
+        :return: Review text.
+        """
+        if self.method == 'zstd':
+            return self._decompressor.decompress(blob).decode('utf-8')
+
+        decompressor = self._decompressor.copy()
+        return (decompressor.decompress(blob) + decompressor.flush()).decode('utf-8')
+
+    def decompress_batch(self, blobs: Sequence[bytes]) -> List[str]:
+        """
+        Same as decompress, but for multiple review texts at once. Uses multi-threaded decompression of zstandard, if
+        available.
+
+        :param blobs: Compressed review texts.
+        :return: Review texts in the same order.
+        """
+        if self.method == 'zstd':
+            # Batch decompression crashes if all frames are empty, empty texts are therefore excluded
+            non_empty = [i for i, blob in enumerate(blobs) if zstandard.frame_content_size(blob) != 0]
+            if len(non_empty) > 0:
+                try:
+                    buffers = self._decompressor.multi_decompress_to_buffer([blobs[i] for i in non_empty], threads=-1)
+                except NotImplementedError:
+                    # Only the C backend of zstandard supports batch decompression
+                    return [self.decompress(blob) for blob in blobs]
+                texts = [''] * len(blobs)
+                for buffer_idx, blob_idx in enumerate(non_empty):
+                    texts[blob_idx] = buffers[buffer_idx].tobytes().decode('utf-8')
+                return texts
+        return [self.decompress(blob) for blob in blobs]
@@ -1,12 +1,14 @@
 from pathlib import Path
-from typing import Union
+from typing import Iterator, List, Optional, Tuple, Union
 
 from sqlalchemy import create_engine
-from sqlalchemy.orm import Query, sessionmaker
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Query, sessionmaker, undefer
 
 from YelpDataset import create_sqlite_db
 
 from .models import *
+from .TextCodec import TextCodec
 
 
 class YelpDataset:
@@ -16,6 +18,7 @@ class YelpDataset:
         """
         self._connection_string = f'sqlite:///{path}'
         self.session = None
+        self.text_codec = None
 
     def __enter__(self):
         self.connect()
@@ -31,6 +34,8 @@ class YelpDataset:
         engine = create_engine(self._connection_string, echo=False)
         Session = sessionmaker(bind=engine)
         self.session = Session()
+        self.text_codec = self._load_text_codec()
+        self.session.info[TEXT_CODEC_KEY] = self.text_codec
 
     def close_session(self) -> None:
         """
@@ -39,6 +44,7 @@ class YelpDataset:
         if self.session:
             self.session.close()
             self.session = None
+            self.text_codec = None
 
     @property
     def businesses(self) -> Query:
@@ -57,14 +63,71 @@ class YelpDataset:
     @property
     def reviews(self) -> Query:
         """
-        :return: Query over review table.
+        :return: Query over review table. Compressed review texts are loaded along with the reviews. Review texts
+            cannot be used in SQL expressions (e.g. filter, order_by), if they are stored compressed.
         """
-        return self.session.query(YelpReview)
+        query = self.session.query(YelpReview)
+        if self.text_codec is not None:
+            query = query.options(undefer(YelpReview.text_compressed))
+        return query
 
-    def load_data(self, data_dir: Union[str, Path]) -> None:
+    def review_texts(self, query: Optional[Query] = None, batch_size: int = 10_000) -> Iterator[Tuple[int, str]]:
+        """
+        Iterates over review texts without loading the full reviews. Compressed review texts are decompressed
+        batch-wise.
+
+        :param query: Query over review table, e.g. filtered reviews. All reviews, if None.
+        :param batch_size: Number of reviews, fetched and decompressed at once.
+        :return: Iterator over review ids and review texts.
+        """
+        if query is None:
+            query = self.session.query(YelpReview)
+
+        if self.text_codec is None:
+            yield from query.with_entities(YelpReview.id, YelpReview.text).yield_per(batch_size)
+            return
+
+        query = query.with_entities(YelpReview.id, YelpReview.text, YelpReview.text_compressed)
+
+        batch = []
+        for row in query.yield_per(batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                yield from self._decode_review_texts(batch)
+                batch = []
+        yield from self._decode_review_texts(batch)
+
+    def _decode_review_texts(self, rows: List[Tuple[int, Optional[str], Optional[bytes]]]) -> List[Tuple[int, str]]:
+        """
+        :param rows: Review ids, uncompressed and compressed review texts.
+        :return: Review ids and review texts.
+        """
+        compressed = [text_compressed for _, text, text_compressed in rows if text is None and text_compressed]
+        decompressed = iter(self.text_codec.decompress_batch(compressed))
+        return [
+            (review_id, next(decompressed) if text is None and text_compressed else text)
+            for review_id, text, text_compressed in rows
+        ]
+
+    def _load_text_codec(self) -> Optional[TextCodec]:
+        """
+        :return: Codec of compressed review texts or None, if review texts are stored uncompressed.
+        """
+        try:
+            codec = self.session.query(YelpTextCodec).first()
+        except OperationalError:
+            # Databases created before review text compression have no text codec table
+            self.session.rollback()
+            return None
+        if codec is None:
+            return None
+        return TextCodec(codec.method, codec.dictionary)
+
+    def load_data(self, data_dir: Union[str, Path], compression: Optional[str] = None) -> None:
         """
         Creates database initially and fills it with the Yelp dataset.
 
         :param data_dir: Path to Yelp dataset directory (contains a json for each table).
+        :param compression: Optional compression method of review texts ('zstd' or 'zlib').
         """
-        create_sqlite_db(self._connection_string, data_dir)
+        create_sqlite_db(self._connection_string, data_dir, compression)
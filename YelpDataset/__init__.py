@@ -1,3 +1,4 @@
 from .create_sqlite_db import create_sqlite_db
 from .YelpDataset import YelpDataset
-from .models import YelpUser, YelpCity, YelpReview, YelpCategory, YelpBusiness, YelpCategoryBusinessRel
\ No newline at end of file
+from .models import YelpUser, YelpCity, YelpReview, YelpCategory, YelpBusiness, YelpCategoryBusinessRel, YelpTextCodec
+from .TextCodec import TextCodec
\ No newline at end of file
@@ -3,7 +3,7 @@ import json
 from datetime import datetime, timedelta
 from pathlib import Path
 from timeit import default_timer as timer
-from typing import Any, Dict, List, Union, TYPE_CHECKING
+from typing import Any, Dict, List, Optional, Union, TYPE_CHECKING
 
 from sqlalchemy import create_engine, Index, Table
 from sqlalchemy.exc import OperationalError
@@ -12,20 +12,34 @@ if TYPE_CHECKING:
     from sqlalchemy.engine import Engine
 
 from .MappingDict import MappingDict
-from .models import Base, YelpBusiness, YelpCategory, YelpCategoryBusinessRel, YelpCity, YelpUser, YelpReview
+from .models import Base, YelpBusiness, YelpCategory, YelpCategoryBusinessRel, YelpCity, YelpUser, YelpReview, \
+    YelpTextCodec
+from .TextCodec import TextCodec
 
 BATCH_SIZE = 100_000
+DICT_SAMPLE_SIZE = 100_000
 DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
 
-def create_sqlite_db(connection_string: str, data_dir: Union[str, Path]) -> None:
+def create_sqlite_db(connection_string: str, data_dir: Union[str, Path], compression: Optional[str] = None) -> None:
     """
     Creates an sqlite database according to the connection string and fills it with the Yelp dataaset located in
     data_dir.
 
     :param connection_string: Sqlite connection string to new database.
     :param data_dir: Yelp dataset directory.
+    :param compression: Optional compression method of review texts ('zstd' or 'zlib'). Review texts are stored
+        uncompressed, if None.
     """
+    data_dir = Path(data_dir)
+    review_path = data_dir / 'yelp_academic_dataset_review.json'
+
+    # Fail before the database file is created, a partially created database blocks subsequent runs
+    text_codec = None
+    if compression is not None:
+        TextCodec.check_method(compression)
+        text_codec = _train_text_codec(review_path, compression)
+
     print("Create tables")
     engine = create_engine(connection_string, echo=False)
     try:
@@ -33,15 +47,18 @@ def create_sqlite_db(connection_string: str, data_dir: Union[str, Path]) -> None
     except OperationalError:
         raise RuntimeError("Database already exists")
 
-    data_dir = Path(data_dir)
+    if text_codec is not None:
+        codec_row = {'id': 0, 'method': text_codec.method, 'dictionary': text_codec.dictionary}
+        _insert_data(engine, YelpTextCodec, [codec_row])
 
     business_mapping = _insert_businesses(engine, data_dir / 'yelp_academic_dataset_business.json')
     user_mapping = _insert_users(engine, data_dir / 'yelp_academic_dataset_user.json')
     _insert_reviews(
         engine,
-        data_dir / 'yelp_academic_dataset_review.json',
+        review_path,
         business_mapping,
         user_mapping,
+        text_codec,
     )
 
     print("Create indices", end=' ')
@@ -166,14 +183,41 @@ def _insert_users(engine: Engine, json_path: Union[str, Path]) -> Dict[str, int]
     return user_mapping
 
 
+def _train_text_codec(json_path: Union[str, Path], method: str) -> TextCodec:
+    """
+    Trains a compression dictionary on the first DICT_SAMPLE_SIZE reviews of 'yelp_academic_dataset_review.json'.
+
+    :param json_path: Path to 'yelp_academic_dataset_review.json'.
+    :param method: Compression method, either 'zstd' or 'zlib'.
+    :return: Trained codec.
+    """
+    print("Train compression dictionary", end=' ')
+
+    start_time = timer()
+
+    samples = []
+    with open(json_path, 'r') as fd:
+        for idx, line in enumerate(fd):
+            if idx == DICT_SAMPLE_SIZE:
+                break
+            samples.append(json.loads(line)['text'])
+
+    text_codec = TextCodec.train(samples, method)
+
+    print(f"# ({timedelta(seconds=timer() - start_time)}, {len(text_codec.dictionary)} bytes)")
+    return text_codec
+
+
 def _insert_reviews(
-        engine: Engine, json_path: Union[str, Path], business_mapping: Dict[str, int], user_mapping: Dict[str, int]
+        engine: Engine, json_path: Union[str, Path], business_mapping: Dict[str, int], user_mapping: Dict[str, int],
+        text_codec: Optional[TextCodec] = None,
 ) -> None:
     """
     Fills business table with data from 'yelp_academic_dataset_review.json'.
 
     :param engine: Database engine.
     :param json_path: Path to 'yelp_academic_dataset_review.json'.
+    :param text_codec: Codec to compress review texts with. Review texts are stored uncompressed, if None.
     """
     print("Insert reviews", end=' ')
 
@@ -186,6 +230,9 @@ def _insert_reviews(
             data['business_id'] = business_mapping[data['business_id']]
             data['user_id'] = user_mapping[data['user_id']]
             data['date'] = datetime.strptime(data['date'], DATE_FORMAT)
+            if text_codec is not None:
+                data['text_compressed'] = text_codec.compress(data['text'])
+                data['text'] = None
 
             buffer_review.append({
                 'id': idx, **data,
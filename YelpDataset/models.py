@@ -1,10 +1,20 @@
-from sqlalchemy import Column, Date, Float, ForeignKey, Integer, SmallInteger, String, Table
+from typing import Optional
+
+from sqlalchemy import Column, Date, Float, ForeignKey, Integer, LargeBinary, SmallInteger, String, Table
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import deferred, object_session, relationship
+
+from .TextCodec import TextCodec
 
 
 Base = declarative_base()
 
+"""
+Key of the TextCodec in Session.info, used to decompress review texts.
+"""
+TEXT_CODEC_KEY = 'text_codec'
+
 
 """
 Relation table between Yelp categories and Yelp businesses.
@@ -102,7 +112,8 @@ class YelpReview(Base):
     useful = Column(Integer)
     funny = Column(Integer)
     cool = Column(Integer)
-    text = Column(String)
+    _text = Column('text', String)
+    text_compressed = deferred(Column(LargeBinary))
     date = Column(Date)
     language = Column(String)
 
@@ -111,3 +122,56 @@ class YelpReview(Base):
 
     user = relationship(YelpUser, backref='reviews')
     business = relationship(YelpBusiness, backref='reviews')
+
+    @hybrid_property
+    def text(self) -> Optional[str]:
+        """
+        Review text, decompressed if the database stores compressed review texts.
+
+        *Remark*: In SQL expressions (e.g. filter, order_by), text refers to the uncompressed text column, which is NULL
+        in databases with compressed review texts. Filter compressed review texts in Python, e.g. with
+        YelpDataset.review_texts.
+        """
+        text_codec = self._text_codec()
+        if text_codec is None:
+            # Compressed text of a review, that was loaded with a text codec but is detached from its session
+            if self._text is None and self.__dict__.get('text_compressed') is not None:
+                raise RuntimeError("Compressed review text requires a session with text codec")
+            return self._text
+
+        if self._text is None and self.text_compressed is not None:
+            return text_codec.decompress(self.text_compressed)
+        return self._text
+
+    @text.setter
+    def text(self, value: Optional[str]) -> None:
+        text_codec = self._text_codec()
+        if text_codec is None:
+            self._text = value
+            if self.__dict__.get('text_compressed') is not None:
+                self.text_compressed = None
+        else:
+            self._text = None
+            self.text_compressed = text_codec.compress(value) if value is not None else None
+
+    @text.expression
+    def text(cls):
+        return cls._text
+
+    def _text_codec(self) -> Optional[TextCodec]:
+        """
+        :return: Text codec of the session, None if review texts are stored uncompressed or review has no session.
+        """
+        session = object_session(self)
+        return session.info.get(TEXT_CODEC_KEY) if session is not None else None
+
+
+class YelpTextCodec(Base):
+    """
+    Compression method and dictionary of compressed review texts. Contains at most one row.
+    """
+    __tablename__ = 'text_codec'
+
+    id = Column(Integer, primary_key=True)
+    method = Column(String)
+    dictionary = Column(LargeBinary)
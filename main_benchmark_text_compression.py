@@ -0,0 +1,107 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from timeit import default_timer as timer
+from typing import Optional
+
+from YelpDataset import YelpDataset
+
+
+def drop_file_cache(path: Path) -> bool:
+    """
+    Evicts the file from the OS page cache, so that the next read hits the disk.
+
+    :param path: Path to file.
+    :return: Whether the file could be evicted (Unix only).
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def scan_reviews(database_path: Path, label: str) -> None:
+    """
+    Reopens the database and prints the throughput of a full scan over all review texts.
+
+    :param database_path: Path to sqlite database.
+    :param label: Description of the scan, printed along with the throughput.
+    """
+    with YelpDataset(database_path) as yelp:
+        start = timer()
+        n_reviews, n_bytes = 0, 0
+        for _, text in yelp.review_texts():
+            n_reviews += 1
+            n_bytes += len(text.encode('utf-8'))
+        seconds = timer() - start
+
+    print(f"    {label}: full scan of {n_reviews} reviews in {timedelta(seconds=seconds)} "
+          f"({n_reviews / seconds:.0f} reviews/s, {n_bytes / seconds / 2**20:.1f} MiB text/s)")
+
+
+def benchmark_database(database_path: Path, json_dir: str, compression: Optional[str] = None) -> None:
+    """
+    Creates a database from the Yelp dataset and prints its size and the throughput of a full scan over all review
+    texts, first with cold and then with warm OS page cache.
+
+    :param database_path: Path to the new sqlite database.
+    :param json_dir: Path to Yelp dataset JSON files.
+    :param compression: Compression method of review texts, uncompressed if None.
+    """
+    # Each database is created in a separate process, indices can be created only once per process
+    command = [sys.executable, str(Path(__file__).parent / 'main_create_sqlite_database.py'), str(database_path),
+               '--json_dir', json_dir]
+    if compression is not None:
+        command += ['--compression', compression]
+    subprocess.run(command, check=True)
+
+    size = os.path.getsize(database_path)
+    print(f"[{compression or 'uncompressed'}] Database size: {size / 2**20:.1f} MiB")
+
+    if drop_file_cache(database_path):
+        scan_reviews(database_path, "1st pass, cold cache")
+    else:
+        scan_reviews(database_path, "1st pass, cache state unknown (cannot evict file from page cache)")
+    scan_reviews(database_path, "2nd pass, warm cache")
+
+
+def run_benchmark(output_dir: Path, json_dir: str, compression: str) -> None:
+    """
+    :param output_dir: Directory of the created databases.
+    :param json_dir: Path to Yelp dataset JSON files.
+    :param compression: Compression method of review texts.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    benchmark_database(output_dir / 'yelp_uncompressed.sqlite', json_dir)
+    benchmark_database(output_dir / f'yelp_{compression}.sqlite', json_dir, compression)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare size and full scan throughput of the SQLite database with '
+                                                 'uncompressed and compressed review texts.')
+    parser.add_argument('json_dir', type=str, help='Path to Yelp dataset JSON files')
+    parser.add_argument('--compression', '-c', type=str, choices=['zstd', 'zlib'], default='zstd',
+                        help='Compression method of review texts (default: zstd)')
+    parser.add_argument('--output_dir', type=str,
+                        help='Directory of the created databases, a temporary directory is used if not specified')
+
+    args = parser.parse_args()
+
+    if args.output_dir:
+        run_benchmark(Path(args.output_dir), args.json_dir, args.compression)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            run_benchmark(Path(tmp_dir), args.json_dir, args.compression)
+
+
+if __name__ == '__main__':
+    main()
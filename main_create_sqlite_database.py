@@ -14,6 +14,8 @@ def main():
     parser.add_argument('--language', '-l', action='store_true',
                         help='Add language information to reviews')
     parser.add_argument('--json_dir', type=str, help='Path to Yelp dataset JSON files')
+    parser.add_argument('--compression', '-c', type=str, choices=['zstd', 'zlib'],
+                        help='Store review texts compressed with the given method')
 
     args = parser.parse_args()
 
@@ -23,7 +25,7 @@ def main():
         if not args.json_dir:
             print("Specify Yelp dataset JSON directory")
             return
-        yelp.load_data(args.json_dir)
+        yelp.load_data(args.json_dir, args.compression)
     else:
         print("Database alreay exists. Skip data filling")
 
@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from YelpDataset.TextCodec import TextCodec, zstandard
+
+WORDS = ['the', 'food', 'was', 'great', 'service', 'slow', 'pizza', 'burger', 'friendly', 'staff', 'come', 'back']
+TEXTS = ['', 'Très bon, on reviendra! 🍕', '美味しいラーメン', 'a' * 10_000]
+
+
+def sample_texts(n: int) -> list:
+    """
+    :param n: Number of texts.
+    :return: Random review like texts.
+    """
+    rnd = random.Random(0)
+    return [' '.join(rnd.choices(WORDS, k=rnd.randint(10, 100))) for _ in range(n)]
+
+
+class TextCodecTest(unittest.TestCase):
+    def check_round_trip(self, codec: TextCodec) -> None:
+        texts = TEXTS + sample_texts(100)
+        blobs = [codec.compress(text) for text in texts]
+
+        self.assertEqual([codec.decompress(blob) for blob in blobs], texts)
+        self.assertEqual(codec.decompress_batch(blobs), texts)
+        self.assertEqual(codec.decompress_batch([]), [])
+
+    def test_zlib(self):
+        codec = TextCodec.train(sample_texts(1000), 'zlib')
+        self.assertLessEqual(len(codec.dictionary), 32 * 1024)
+        self.check_round_trip(codec)
+
+    def test_zlib_without_dictionary(self):
+        self.check_round_trip(TextCodec('zlib'))
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd(self):
+        self.check_round_trip(TextCodec.train(sample_texts(1000), 'zstd'))
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd_without_dictionary(self):
+        self.check_round_trip(TextCodec('zstd'))
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd_small_sample(self):
+        for samples in ([], [''], ['short text'], ['short text'] * 5):
+            with self.subTest(samples=samples):
+                self.check_round_trip(TextCodec.train(samples, 'zstd'))
+
+    def test_restored_codec(self):
+        codec = TextCodec.train(sample_texts(1000), 'zlib')
+        restored = TextCodec(codec.method, codec.dictionary)
+        self.assertEqual(restored.decompress(codec.compress(TEXTS[1])), TEXTS[1])
+
+    def test_dictionary_shrinks_texts(self):
+        texts = sample_texts(1000)
+        plain, trained = TextCodec('zlib'), TextCodec.train(texts, 'zlib')
+        self.assertLess(sum(len(trained.compress(text)) for text in texts),
+                        sum(len(plain.compress(text)) for text in texts))
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            TextCodec.check_method('lzma')
+        with self.assertRaises(ValueError):
+            TextCodec('lzma')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+import json
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List, Optional
+from unittest import mock
+
+from YelpDataset import YelpDataset, YelpReview, create_sqlite_db
+from YelpDataset.TextCodec import zstandard
+
+from tests.test_text_codec import TEXTS, sample_texts
+
+ROOT_DIR = Path(__file__).parent.parent
+N_USERS = 10
+N_BUSINESSES = 5
+REVIEW_TEXTS = TEXTS + sample_texts(1000)
+
+
+def write_dataset(data_dir: Path, review_texts: List[str] = REVIEW_TEXTS) -> None:
+    """
+    Writes a small synthetic Yelp dataset to data_dir.
+
+    :param data_dir: Yelp dataset directory.
+    :param review_texts: Texts of the reviews.
+    """
+    with open(data_dir / 'yelp_academic_dataset_business.json', 'w') as fd:
+        for i in range(N_BUSINESSES):
+            fd.write(json.dumps({
+                'business_id': f'b{i}', 'name': 'Name', 'address': 'Address', 'postal_code': '12345',
+                'latitude': 1.0, 'longitude': 2.0, 'stars': 4.0, 'review_count': 1, 'city': 'City', 'state': 'ST',
+                'categories': 'Pizza, Burgers',
+            }) + '\n')
+    with open(data_dir / 'yelp_academic_dataset_user.json', 'w') as fd:
+        for i in range(N_USERS):
+            fd.write(json.dumps({
+                'user_id': f'u{i}', 'name': 'Name', 'review_count': 1, 'yelping_since': '2010-01-01 00:00:00',
+                'friends': '', 'useful': 0, 'funny': 0, 'cool': 0, 'elite': '', 'fans': 0, 'average_stars': 4.0,
+                'compliment_hot': 0, 'compliment_more': 0, 'compliment_profile': 0, 'compliment_cute': 0,
+                'compliment_list': 0, 'compliment_note': 0, 'compliment_plain': 0, 'compliment_cool': 0,
+                'compliment_funny': 0, 'compliment_writer': 0, 'compliment_photos': 0,
+            }) + '\n')
+    with open(data_dir / 'yelp_academic_dataset_review.json', 'w') as fd:
+        for i, text in enumerate(review_texts):
+            fd.write(json.dumps({
+                'review_id': f'r{i}', 'user_id': f'u{i % N_USERS}', 'business_id': f'b{i % N_BUSINESSES}',
+                'stars': 4.0, 'useful': 0, 'funny': 0, 'cool': 0, 'text': text, 'date': '2015-01-01 00:00:00',
+            }) + '\n')
+
+
+def create_database(database_path: Path, data_dir: Path, compression: Optional[str] = None) -> None:
+    """
+    Creates the database in a separate process, indices can be created only once per process.
+
+    :param database_path: Path to the new sqlite database.
+    :param data_dir: Yelp dataset directory.
+    :param compression: Compression method of review texts, uncompressed if None.
+    """
+    command = [sys.executable, str(ROOT_DIR / 'main_create_sqlite_database.py'), str(database_path),
+               '--json_dir', str(data_dir)]
+    if compression is not None:
+        command += ['--compression', compression]
+    subprocess.run(command, check=True, cwd=ROOT_DIR, stdout=subprocess.DEVNULL)
+
+
+class YelpDatasetTestMixin:
+    compression = None
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(cls.tmp_dir.name)
+        write_dataset(data_dir)
+        cls.database_path = data_dir / 'yelp.sqlite'
+        create_database(cls.database_path, data_dir, cls.compression)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        self.yelp = YelpDataset(self.database_path)
+        self.yelp.connect()
+
+    def tearDown(self):
+        self.yelp.close_session()
+
+    def test_text(self):
+        texts = [review.text for review in self.yelp.reviews.order_by(YelpReview.id)]
+        self.assertEqual(texts, REVIEW_TEXTS)
+
+    def test_review_texts(self):
+        for batch_size in (1, 7, len(REVIEW_TEXTS), len(REVIEW_TEXTS) + 1):
+            with self.subTest(batch_size=batch_size):
+                texts = list(self.yelp.review_texts(batch_size=batch_size))
+                self.assertEqual(texts, list(enumerate(REVIEW_TEXTS)))
+
+    def test_review_texts_query(self):
+        query = self.yelp.reviews.filter(YelpReview.id.in_([1, 2, 5]))
+        self.assertEqual(sorted(self.yelp.review_texts(query, batch_size=2)),
+                         [(1, REVIEW_TEXTS[1]), (2, REVIEW_TEXTS[2]), (5, REVIEW_TEXTS[5])])
+
+    def test_set_text(self):
+        review = self.yelp.reviews.filter(YelpReview.id == 3).one()
+        review.text = 'Neuer Text'
+        self.yelp.session.commit()
+        try:
+            self.yelp.session.expire_all()
+            self.assertEqual(self.yelp.reviews.filter(YelpReview.id == 3).one().text, 'Neuer Text')
+            self.assertEqual(dict(self.yelp.review_texts())[3], 'Neuer Text')
+
+            # Row never holds uncompressed and compressed text at once
+            with sqlite3.connect(self.database_path) as connection:
+                connection.row_factory = sqlite3.Row
+                row = connection.execute('SELECT * FROM review WHERE id = 3').fetchone()
+            if 'text_compressed' in row.keys():
+                self.assertTrue(row['text'] is None or row['text_compressed'] is None)
+        finally:
+            review = self.yelp.reviews.filter(YelpReview.id == 3).one()
+            review.text = REVIEW_TEXTS[3]
+            self.yelp.session.commit()
+
+
+class UncompressedYelpDatasetTest(YelpDatasetTestMixin, unittest.TestCase):
+    def test_no_text_codec(self):
+        self.assertIsNone(self.yelp.text_codec)
+
+    def test_text_filter(self):
+        self.assertEqual(self.yelp.reviews.filter(YelpReview.text.like('%ラーメン%')).count(), 1)
+
+
+class ZlibYelpDatasetTest(YelpDatasetTestMixin, unittest.TestCase):
+    compression = 'zlib'
+
+    def test_text_stored_compressed(self):
+        self.assertEqual(self.yelp.text_codec.method, 'zlib')
+        self.assertEqual(self.yelp.reviews.filter(YelpReview.text.isnot(None)).count(), 0)
+
+    def test_detached_review(self):
+        review = self.yelp.reviews.filter(YelpReview.id == 1).one()
+        self.yelp.session.expunge(review)
+        with self.assertRaises(RuntimeError):
+            review.text
+
+
+@unittest.skipIf(zstandard is None, "zstandard not installed")
+class ZstdYelpDatasetTest(YelpDatasetTestMixin, unittest.TestCase):
+    compression = 'zstd'
+
+    def test_text_stored_compressed(self):
+        self.assertEqual(self.yelp.text_codec.method, 'zstd')
+        self.assertEqual(self.yelp.reviews.filter(YelpReview.text.isnot(None)).count(), 0)
+
+
+class LegacyYelpDatasetTest(YelpDatasetTestMixin, unittest.TestCase):
+    """
+    Database created before review text compression, without text codec table and compressed text column.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        with sqlite3.connect(cls.database_path) as connection:
+            connection.execute('DROP TABLE text_codec')
+            connection.execute('ALTER TABLE review DROP COLUMN text_compressed')
+
+    def test_null_text(self):
+        review = self.yelp.reviews.filter(YelpReview.id == 0).one()
+        review.text = None
+        self.yelp.session.commit()
+        try:
+            self.assertIsNone(self.yelp.reviews.filter(YelpReview.id == 0).one().text)
+        finally:
+            review.text = REVIEW_TEXTS[0]
+            self.yelp.session.commit()
+
+
+class CreateDatabaseTest(unittest.TestCase):
+    def test_unknown_compression(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database_path = Path(tmp_dir) / 'yelp.sqlite'
+            with self.assertRaises(ValueError):
+                create_sqlite_db(f'sqlite:///{database_path}', tmp_dir, 'lzma')
+            self.assertFalse(database_path.exists())
+
+    def test_zstandard_missing(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            database_path = Path(tmp_dir) / 'yelp.sqlite'
+            with mock.patch('YelpDataset.TextCodec.zstandard', None), self.assertRaises(RuntimeError):
+                create_sqlite_db(f'sqlite:///{database_path}', tmp_dir, 'zstd')
+            self.assertFalse(database_path.exists())
+
+    @unittest.skipIf(zstandard is None, "zstandard not installed")
+    def test_zstd_few_reviews(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir)
+            write_dataset(data_dir, TEXTS[:3])
+            database_path = data_dir / 'yelp.sqlite'
+            create_database(database_path, data_dir, 'zstd')
+
+            with YelpDataset(database_path) as yelp:
+                self.assertEqual(yelp.text_codec.method, 'zstd')
+                self.assertEqual(list(yelp.review_texts()), list(enumerate(TEXTS[:3])))
+
+
+if __name__ == '__main__':
+    unittest.main()